@@ -293,7 +293,7 @@ class JBIG2Images():
             if zfile.filename.endswith(".sym"):
                 with zf.open(zfile) as f:
                     data = f.read()
-                    stream = pdf.PDFStream([(pdf.PDFName("Length"), pdf.PDFNumeric(len(data)))], data)
+                    stream = pdf.PDFStream([], data)
                     self._jb2_globals = pdf.PDFObject(stream)
                 return
         raise ValueError("Could not find a symbol file.")
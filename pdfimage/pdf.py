@@ -12,6 +12,8 @@ Some resources:
 """
 
 import collections as _collections
+import re as _re
+import weakref as _weakref
 
 class PDFObjectId():
     """Identified for a PDF object.
@@ -22,6 +24,8 @@ class PDFObjectId():
     def __init__(self, number, generation):
         self._num = number
         self._gen = generation
+        self._hash = hash((number, generation))
+        self._bytes = None
 
     @property
     def number(self):
@@ -35,13 +39,15 @@ class PDFObjectId():
         return isinstance(other, PDFObjectId) and self._num == other._num and self._gen == other._gen
 
     def __hash__(self):
-        return hash(str(self._num) + str(self._gen))
+        return self._hash
 
     def __repr__(self):
         return "PDFObjectId({}, {})".format(self._num, self._gen)
 
     def __bytes__(self):
-        return "{} {} R".format(self._num, self._gen).encode()
+        if self._bytes is None:
+            self._bytes = "{} {} R".format(self._num, self._gen).encode()
+        return self._bytes
 
 
 class PDFObject(PDFObjectId):
@@ -72,6 +78,8 @@ class PDFObject(PDFObjectId):
     @number.setter
     def number(self, n):
         self._num = n
+        self._hash = hash((self._num, self._gen))
+        self._bytes = None
 
     @property
     def generation(self):
@@ -80,6 +88,8 @@ class PDFObject(PDFObjectId):
     @generation.setter
     def generation(self, g):
         self._gen = g
+        self._hash = hash((self._num, self._gen))
+        self._bytes = None
 
     def __repr__(self):
         return "PDFObject({}, {})".format(self._num, self._gen)
@@ -91,8 +101,15 @@ class PDFObject(PDFObjectId):
 
 
 class PDFBoolean():
+    """Booleans are a pair of singletons, so no allocation occurs and
+    comparisons short-circuit on identity."""
+    def __new__(cls, value):
+        if value:
+            return cls._TRUE
+        return cls._FALSE
+
     def __init__(self, value):
-        self._v = value
+        pass
 
     @property
     def value(self):
@@ -115,19 +132,24 @@ class PDFBoolean():
             return b"true"
         return b"false"
 
+PDFBoolean._TRUE = object.__new__(PDFBoolean)
+PDFBoolean._TRUE._v = True
+PDFBoolean._FALSE = object.__new__(PDFBoolean)
+PDFBoolean._FALSE._v = False
+
 
 class PDFNumeric():
     """A numeric object.  Initialise with an int, a float, or a string or bytes.
     Raises `ValueError` on failure to convert."""
+    __slots__ = ("_v", "_b")
+
     def __init__(self, value):
         if isinstance(value, bytes):
-            value = value.decode()
-        if isinstance(value, str):
-            if "." in value:
-                value = float(value)
-            else:
-                value = int(value)
+            value = float(value) if b"." in value else int(value)
+        elif isinstance(value, str):
+            value = float(value) if "." in value else int(value)
         self._v = value
+        self._b = None
 
     @property
     def value(self):
@@ -149,9 +171,19 @@ class PDFNumeric():
         return "PDFNumeric({})".format(self._v)
 
     def __bytes__(self):
-        return str(self._v).encode()
+        if self._b is None:
+            if isinstance(self._v, int):
+                self._b = b"%d" % self._v
+            else:
+                self._b = str(self._v).encode()
+        return self._b
 
 
+_STR_ESCAPE_RE = _re.compile(rb"[()\\\n\r\t\b\f]")
+_STR_ESCAPE_MAP = {b"(": b"\\(", b")": b"\\)", b"\\": b"\\\\",
+        b"\n": b"\\n", b"\r": b"\\r", b"\t": b"\\t",
+        b"\b": b"\\b", b"\f": b"\\f"}
+
 class PDFString():
     """Actually a _bytes_ string!"""
     def __init__(self, value):
@@ -174,36 +206,39 @@ class PDFString():
         return "PDFString({})".format(self._v)
 
     def __bytes__(self):
-        out = b"("
-        for i in range(len(self._v)):
-            x = self._v[i:i+1]
-            if x == b"\n":
-                out += b"\\n"
-            elif x == b"\r":
-                out += b"\\r"
-            elif x == b"\t":
-                out += b"\\t"
-            elif x == b"\b":
-                out += b"\\b"
-            elif x == b"\f":
-                out += b"\\f"
-            elif x == b"(":
-                out += b"\\("
-            elif x == b")":
-                out += b"\\)"
-            elif x == b"\\":
-                out += b"\\\\"
-            else:
-                out += x
-        return out + b")"
+        if _STR_ESCAPE_RE.search(self._v) is None:
+            return b"(" + self._v + b")"
+        escaped = _STR_ESCAPE_RE.sub(
+                lambda match: _STR_ESCAPE_MAP[match.group()], self._v)
+        return b"(" + escaped + b")"
+
 
+_NAME_REGULAR = bytes(range(33, 127))
+_NAME_TABLE = [bytes([c]) if 33 <= c <= 126 else b"#%02X" % c
+        for c in range(256)]
 
 class PDFName():
-    def __init__(self, name):
+    """Names are interned: constructing the same name twice yields the same
+    object, so dictionary lookups on the very common names (`/Type`,
+    `/Length` and so forth) short-circuit on identity."""
+    _cache = _weakref.WeakValueDictionary()
+
+    def __new__(cls, name):
         try:
-            self._v = bytes(name)
+            key = bytes(name)
         except TypeError:
-            self._v = name.encode()
+            key = name.encode()
+        obj = cls._cache.get(key)
+        if obj is None:
+            obj = super().__new__(cls)
+            obj._v = key
+            obj._hash = hash(key)
+            obj._bytes = None
+            cls._cache[key] = obj
+        return obj
+
+    def __init__(self, name):
+        pass
 
     @property
     def name(self):
@@ -213,27 +248,31 @@ class PDFName():
         return isinstance(other, PDFName) and self._v == other._v
 
     def __hash__(self):
-        return hash(self._v)
+        return self._hash
 
     def __repr__(self):
         return "PDFName({})".format(self._v)
 
     def __bytes__(self):
-        out = b"/"
-        for x in self._v:
-            if x >= 33 and x <= 126:
-                out += bytes([x])
-            elif x == 0:
+        if self._bytes is not None:
+            return self._bytes
+        if not self._v.translate(None, _NAME_REGULAR):
+            # Every byte is a regular character; no escaping needed.
+            out = b"/" + self._v
+        else:
+            if 0 in self._v:
                 raise ValueError("Cannot have 0 byte in name")
-            else:
-                h = hex(x)[2:].upper().encode()
-                if len(h) == 1:
-                    h = b"0" + h
-                out += b"#" + h
+            out = b"/" + b"".join(_NAME_TABLE[x] for x in self._v)
+        # Interned, so each unique name is escaped at most once per process.
+        self._bytes = out
         return out
 
 
 class PDFNull():
+    """A singleton sentinel."""
+    def __new__(cls):
+        return cls._INST
+
     def __eq__(self, other):
         return isinstance(other, PDFNull)
 
@@ -243,6 +282,8 @@ class PDFNull():
     def __bytes__(self):
         return b"null"
 
+PDFNull._INST = object.__new__(PDFNull)
+
 
 class PDFArray():
     def __init__(self, entries=[]):
@@ -270,6 +311,20 @@ class PDFDictionary(_collections.UserDict):
         super().__init__()
         for k, v in entry_pairs:
             self.data[k] = v
+        self._key_bytes = {bytes(k) for k in self.data}
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._key_bytes.add(bytes(key))
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._key_bytes.discard(bytes(key))
+
+    def key_bytes(self):
+        """The serialised forms of the keys, as a `frozenset` of `bytes`;
+        kept in sync as entries are added and removed."""
+        return frozenset(self._key_bytes)
 
     def __hash__(self):
         return hash(self.data)
@@ -284,13 +339,17 @@ class PDFDictionary(_collections.UserDict):
         out = b"\n".join(b" ".join([bytes(k) for k in x]) for x in self.data.items())
         return b"<<" + out + b">>"
 
+    def write_to(self, buf):
+        """Append the serialised form to the `bytearray` `buf`."""
+        buf += bytes(self)
+
 
 class PDFSimpleDict(_collections.UserDict):
     """A simplied PDF Dictionary object, which is just a thin wrapper around a
     standard Python dictionary.  Can be converted to a full
     :class:`PDFDictionary` instance according to these rules:
-      - Each key must be convertible to a :class:`PDFName` instance (i.e. a
-        string or bytes string)
+      - Each key must be a :class:`PDFName` instance, or convertible to one
+        (i.e. a string or bytes string)
       - Values can be:
         - Strings / Bytes, which are converted to :class:`PDFName` instances
         - Numbers, which are converted to :class:`PDFNumeric` instances
@@ -304,7 +363,8 @@ class PDFSimpleDict(_collections.UserDict):
         """Convert to a :class:`PDFDictionary` instance"""
         value_pairs = []
         for key, value in self.items():
-            key = PDFName(key)
+            if not isinstance(key, PDFName):
+                key = PDFName(key)
             if isinstance(value, str) or isinstance(value, bytes):
                 value = PDFName(value)
             elif isinstance(value, bool):
@@ -338,10 +398,15 @@ class PDFRawStream():
 
 
 class PDFStream(PDFDictionary):
-    """Combines a dictionary and the associated stream."""
+    """Combines a dictionary and the associated stream.  If the entry pairs
+    do not contain a `Length` entry, one is added automatically from the
+    stream data; entries keep their insertion order when serialised."""
     def __init__(self, entry_pairs, stream_data):
         super().__init__(entry_pairs)
         self._stream_data = stream_data
+        key = PDFName("Length")
+        if key not in self.data:
+            self[key] = PDFNumeric(len(stream_data))
 
     @property
     def stream_contents(self):
@@ -361,3 +426,12 @@ class PDFStream(PDFDictionary):
         out = b"\n".join(b" ".join([bytes(k) for k in x]) for x in self.data.items())
         out = b"<<" + out + b">>"
         return out + b"\n" + b"stream\n" + self._stream_data + b"\nendstream"
+
+    def write_to(self, buf):
+        """Append the serialised form to the `bytearray` `buf`, without
+        copying the stream contents into an intermediate bytes object."""
+        buf += b"<<"
+        buf += b"\n".join(b" ".join([bytes(k) for k in x]) for x in self.data.items())
+        buf += b">>\nstream\n"
+        buf += self._stream_data
+        buf += b"\nendstream"
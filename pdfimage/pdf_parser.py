@@ -7,20 +7,59 @@ Does the hard work of parsing low-level PDF into Python objects.
 
 from .pdf import *
 import io as _io
+import re as _re
 
 _WHITESPACE = b"\x00\x09\x0a\x0c\x0d\x20"
 _DELIMS = b"\x00\x09\x0a\x0c\x0d\x20()<>[]{}/%"
 
+_NUMERIC_RE = _re.compile(rb"[0-9.+-]+")
+_NAME_RE = _re.compile(rb"/[^\x00\x09\x0a\x0c\x0d\x20()<>\[\]{}/%]*")
+_NAME_HASH_RE = _re.compile(rb"#(.{0,2})", _re.DOTALL)
+_OBJID_RE = _re.compile(rb"([0-9]+)[\x00\x09\x0a\x0c\x0d\x20]([0-9]+)[\x00\x09\x0a\x0c\x0d\x20]R")
+_OBJID_VIABLE_RE = _re.compile(rb"[0-9]+(?:[\x00\x09\x0a\x0c\x0d\x20][0-9]*)?(?:[\x00\x09\x0a\x0c\x0d\x20])?")
+_HEX_STRING_RE = _re.compile(rb"<([0-9A-Fa-f\x00\x09\x0a\x0c\x0d\x20]*)>")
+_HEX_VIABLE_RE = _re.compile(rb"<[0-9A-Fa-f\x00\x09\x0a\x0c\x0d\x20]*")
+
+
+def _match_stream(regex, data, viable=None, window=64):
+    """Anchored `regex` match against the start of `data`, which may be a
+    :class:`PullBytesStream`; the window is grown while the match could
+    still extend beyond the bytes seen so far.
+
+    :param viable: Optional regex; if the window fills without a match, only
+      keep growing while `viable` fully matches the window (i.e. the bytes
+      seen so far could still be a prefix of a match).
+
+    :return: Pair `(match, chunk)` where `match` may be `None`.
+    """
+    while True:
+        chunk = data[0:window]
+        complete = len(chunk) < window
+        match = regex.match(chunk)
+        if match is not None:
+            if complete or match.end() < len(chunk):
+                return match, chunk
+        elif complete or viable is None or viable.fullmatch(chunk) is None:
+            return match, chunk
+        window *= 2
+
 
 class PullBytesStream():
     """Wrap a file-like object, and allow access to the data as if it were a
-    `bytes` object, buffering more data on demand."""
+    `bytes` object, buffering more data on demand.  The buffer is consumed by
+    advancing an integer cursor, so reads do not copy the unread remainder."""
     def __init__(self, file):
-        try:
-            self._file = _io.BytesIO(file)
-        except TypeError:
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            # The whole input is already in memory, so treat it as one
+            # fully-buffered chunk consumed by pure pointer arithmetic.
+            data = bytes(file)
+            self._file = _io.BytesIO(data)
+            self._file.seek(0, 2)
+            self._buffer = data
+        else:
             self._file = file
-        self._buffer = b""
+            self._buffer = b""
+        self._pos = 0
         self._length = None
 
     def skip_whitespace(self):
@@ -34,51 +73,62 @@ class PullBytesStream():
         self._file.seek(location)
         return total_length - location
 
+    def _buffered(self):
+        return len(self._buffer) - self._pos
+
     def tell(self):
         """The current effective file position."""
-        return self._file.tell() - len(self._buffer)
+        return self._file.tell() - self._buffered()
 
     def read(self, n=-1):
         """Read the next `n` bytes without processing; if `n==-1` (the default)
         the read to the EOF."""
         if n < -1:
             raise ValueError()
-        buf = self._buffer
+        buf, pos = self._buffer, self._pos
         if n == -1:
             self._buffer = b""
+            self._pos = 0
             self._length = None
-            return buf + self._file.read()
-        if n <= len(buf):
-            self._buffer = buf[n:]
-            return buf[:n]
+            return buf[pos:] + self._file.read()
+        if n <= len(buf) - pos:
+            self._pos = pos + n
+            return buf[pos:pos+n]
         self._buffer = b""
+        self._pos = 0
         self._length = None
-        return buf + self._file.read(n - len(buf))
+        return buf[pos:] + self._file.read(n - (len(buf) - pos))
 
     def buffer(self, n):
         """Ensure we have `>= n` bytes in the internal buffer, if possible."""
-        missing = n - len(self._buffer)
+        missing = n - self._buffered()
         if missing > 0:
             self._length = None
-            self._buffer += self._file.read(missing)
+            self._buffer = self._buffer[self._pos:] + self._file.read(missing)
+            self._pos = 0
 
     def __getitem__(self, place):
         if hasattr(place, "step"):
-            places = list(range(len(self))[place])
+            places = range(len(self))[place]
+            if len(places) == 0:
+                return b""
             self.buffer(max(places) + 1)
-            return bytes(self._buffer[p] for p in places)
+            pos = self._pos
+            if place.step is None or place.step == 1:
+                return self._buffer[pos + places[0] : pos + places[-1] + 1]
+            return bytes(self._buffer[pos + p] for p in places)
         else:
             if place < 0:
                 raise IndexError()
             self.buffer(place + 1)
-            if place >= len(self._buffer):
+            if place >= self._buffered():
                 raise IndexError()
-            return self._buffer[place]
+            return self._buffer[self._pos + place]
 
     def __len__(self):
         if self._length is None:
             self._length = self._length_left()
-        return self._length + len(self._buffer)
+        return self._length + self._buffered()
 
 
 class ParseError(Exception):
@@ -97,7 +147,7 @@ def length_suffix_whitespace(data, start_index=0):
     while True:
         if len(data) <= index:
             return index - start_index
-        if data[index:index+1] not in _WHITESPACE:
+        if data[index] not in _WHITESPACE:
             return index - start_index
         index += 1
 
@@ -107,18 +157,18 @@ def bytes_in_context(data, index):
     end = min(len(data), index + 15)
     return data[start:end]
 
+_EOL_TABLE = bytes(1 if c in (0x0a, 0x0d) else 0 for c in range(256))
+
 def at_eol_marker(data, index):
     """Is the array at index indicating an end of line (eol)?
 
     :return: The number of bytes indicating the eol, or 0 if no eol.
     """
-    if len(data) > index and data[index:index+1] == b"\x0a":
-        return 1
-    if len(data) > index+1 and data[index:index+2] == b"\x0d\x0a":
+    if index >= len(data) or not _EOL_TABLE[data[index]]:
+        return 0
+    if data[index] == 0x0d and index + 1 < len(data) and data[index + 1] == 0x0a:
         return 2
-    if len(data) > index and data[index:index+1] == b"\x0d":
-        return 1
-    return 0
+    return 1
 
 
 class Parser():
@@ -152,91 +202,58 @@ class BooleanParser(Parser):
 
 
 class NumericParser(Parser):
-    _NUMERICS = b"0123456789.+-"
     def parse(self, data):
-        index = 0
-        while index < len(data) and data[index] in self._NUMERICS:
-            index += 1
-        if index == 0:
+        match, chunk = _match_stream(_NUMERIC_RE, data)
+        if match is None:
             return None
-        if index < len(data) and data[index] not in _DELIMS:
+        index = match.end()
+        if index < len(chunk) and chunk[index] not in _DELIMS:
             raise ParseError("Number not ended by delimiter in {}".format(bytes_in_context(data, index)))
         try:
-            return PDFNumeric(data[:index]), index
+            return PDFNumeric(match.group()), index
         except ValueError:
             raise ParseError("Not a valid numeric: {}".format(bytes_in_context(data, index)))
 
 
 class StringParser(Parser):
-    _OCT_DIGITS = b"01234567"
+    _END_RE = _re.compile(rb"\\.|\)", _re.DOTALL)
+    _ESC_RE = _re.compile(rb"\\(\n|[0-7]{1,3}|.)", _re.DOTALL)
+    _ESCAPES = {b"n": b"\x0a", b"r": b"\x0d", b"t": b"\t", b"b": b"\b",
+            b"f": b"\f", b"(": b"(", b")": b")", b"\\": b"\\"}
+
+    def _find_close(self, chunk):
+        """Offset of the first unescaped `)` in `chunk`, or `None`."""
+        for match in self._END_RE.finditer(chunk):
+            if match.group() == b")":
+                return match.start()
+        return None
+
+    def _unescape(self, match):
+        code = match.group(1)
+        if code == b"\n":
+            return b""
+        if code[:1] in b"01234567":
+            decimal = int(code, 8)
+            if decimal >= 256:
+                raise ParseError("Invalid octal: {}".format(match.group()))
+            return bytes([decimal])
+        return self._ESCAPES.get(code, code)
 
     def parse(self, data):
         if data[0:1] != b"(":
             return None
-        out = b""
-        index = 1
-        while index < len(data):
-            ch = data[index:index+1]
-            if ch == b")":
+        window = 256
+        while True:
+            chunk = data[1 : 1 + window]
+            end = self._find_close(chunk)
+            if end is not None:
                 break
-            elif ch == b"\n" or ch == b"\r":
-                if index + 1 < len(data) and data[index:index+2] == b"\r\n":
-                    index += 1
-                out += b"\n"
-            elif ch == b"\x5c": # Backslash
-                if index + 1 == len(data):
-                    raise ParseError("Backslash ends datastream")
-                ch = data[index+1:index+2]
-                if ch == b"\x0a" or ch == b"\x0d":
-                    if ch == b"\x0d" and index + 2 < len(data) and data[index+2] == 10:
-                        index += 2
-                    else:
-                        index += 1
-                elif ch == b"n":
-                    out += b"\x0a"
-                    index += 1
-                elif ch == b"r":
-                    out += b"\x0d"
-                    index += 1
-                elif ch == b"t":
-                    out += b"\t"
-                    index += 1
-                elif ch == b"b":
-                    out += b"\b"
-                    index += 1
-                elif ch == b"f":
-                    out += b"\f"
-                    index += 1
-                elif ch == b"(":
-                    out += b"("
-                    index += 1
-                elif ch == b")":
-                    out += b")"
-                    index += 1
-                elif ch == b"\\":
-                    out += b"\\"
-                    index += 1
-                elif ch in self._OCT_DIGITS:
-                    i = index + 1
-                    while i < len(data) and data[i:i+1] in self._OCT_DIGITS and i - index < 4:
-                        i += 1
-                    octal = data[index+1:i]
-                    decimal = 0
-                    for x in octal:
-                        digit = x - 48
-                        decimal = 8 * decimal + digit
-                    if decimal >= 256:
-                        raise ParseError("Invalid octal: {}".format(bytes_in_context(data, index)))
-                    out += bytes([decimal])
-                    index = i - 1
-                else:
-                    pass
-            else:
-                out += ch
-            index += 1
-        if data[index:index+1] != b")":
-            raise ParseError("String not closed with ')'")
-        return PDFString(out), index+1
+            if len(chunk) < window:
+                raise ParseError("String not closed with ')'")
+            window *= 2
+        body = chunk[:end].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        out = self._ESC_RE.sub(self._unescape, body)
+        return PDFString(out), end + 2
 
 
 class HexStringParser(Parser):
@@ -255,52 +272,30 @@ class HexStringParser(Parser):
     def parse(self, data):
         if data[0:1] != b"<":
             return None
-        out = b""
-        index = 1
-        current_pair = b""
-        while index < len(data):
-            ch = data[index:index+1]
-            try:
-                if ch == b">":
-                    if len(current_pair) == 1:
-                        out += self._hex_to_bytes(current_pair + b"0")
-                    break
-                elif ch in _WHITESPACE:
-                    pass
-                elif ch.upper() in self._HEX:
-                    current_pair += ch
-                    if len(current_pair) == 2:
-                        out += self._hex_to_bytes(current_pair)
-                        current_pair = b""
-                else:
-                    raise ParseError()
-            except ParseError:
-                raise ParseError("Not a valid hex string: {}".format(bytes_in_context(data, index)))
-            index += 1
-        if index == len(data):
+        match, chunk = _match_stream(_HEX_STRING_RE, data, _HEX_VIABLE_RE)
+        if match is None:
+            index = _HEX_VIABLE_RE.match(chunk).end()
             raise ParseError("Not a valid hex string: {}".format(bytes_in_context(data, index)))
-        return PDFString(out), index + 1
+        digits = match.group(1).translate(None, _WHITESPACE)
+        if len(digits) % 2 == 1:
+            digits += b"0"
+        return PDFString(bytes.fromhex(digits.decode())), match.end()
         
 
 class ParseName(Parser):
+    @staticmethod
+    def _hash_code(match):
+        code = match.group(1)
+        if len(code) < 2:
+            raise ParseError("Not a valid # code in name: {}".format(match.group()))
+        return HexStringParser._hex_to_bytes(code)
+
     def parse(self, data):
-        if data[:1] != b"/":
+        if data[0:1] != b"/":
             return None
-        out = b""
-        index = 1
-        while index < len(data):
-            ch = data[index:index+1]
-            if ch in _DELIMS:
-                break
-            if ch == b"#":
-                if index + 2 >= len(data):
-                    raise ParseError("Not a valid # code in name: {}".format(bytes_in_context(data, index)))
-                out += HexStringParser._hex_to_bytes(data[index+1:index+3])
-                index += 3
-            else:
-                out += ch
-                index += 1
-        return PDFName(out), index
+        match, chunk = _match_stream(_NAME_RE, data)
+        out = _NAME_HASH_RE.sub(self._hash_code, match.group()[1:])
+        return PDFName(out), match.end()
 
 
 class ParseNull(Parser):
@@ -315,32 +310,16 @@ class ParseNull(Parser):
 
 
 class ParseObjectId(Parser):
-    _DIGITS = b"0123456789"
-    
-    def _parse_number(self, data, index):
-        num_chs = b""
-        while index < len(data) and data[index:index+1] in self._DIGITS:
-            num_chs += data[index:index+1]
-            index += 1
-        if index == len(data):
-            return None
-        if data[index:index+1] not in _WHITESPACE:
-            return None
-        return int(num_chs.decode()), index+1
-        
     def parse(self, data):
-        idnum = self._parse_number(data, 0)
-        if idnum is None:
+        match, chunk = _match_stream(_OBJID_RE, data, _OBJID_VIABLE_RE)
+        if match is None:
             return None
-        idnum, index = idnum
-        gennum = self._parse_number(data, index)
-        if gennum is None:
+        index = match.end()
+        if index >= len(chunk):
+            # As before, an "R" at the very end of the data is not a reference.
             return None
-        gennum, index = gennum
-        if index + 1 >= len(data):
-            return None
-        if data[index:index+1] == b"R" and data[index+1:index+2] in _DELIMS:
-            return PDFObjectId(idnum, gennum), index + 1
+        if chunk[index] in _DELIMS:
+            return PDFObjectId(int(match.group(1)), int(match.group(2))), index
         return None
 
 
@@ -457,16 +436,37 @@ class StreamParser(Parser):
         return PDFRawStream(stream_data), expected_end + eolbytes + 9
 
 
+def _make_token_dispatch():
+    """Map from the first byte of a token to the parsers which could accept
+    it, preserving the historic try-in-order semantics.  The parsers are
+    stateless, so a single shared table of instances suffices."""
+    boolean = BooleanParser()
+    object_id = ParseObjectId()
+    numeric = NumericParser()
+    table = dict()
+    table[0x74] = (boolean,)                              # t
+    table[0x66] = (boolean,)                              # f
+    table[0x6e] = (ParseNull(),)                          # n
+    table[0x2f] = (ParseName(),)                          # /
+    table[0x28] = (StringParser(),)                       # (
+    table[0x3c] = (ParseDictionary(), HexStringParser())  # << or <hex>
+    table[0x5b] = (ParseArray(),)                         # [
+    for byte in b"0123456789":
+        table[byte] = (object_id, numeric)
+    for byte in b"+-.":
+        table[byte] = (numeric,)
+    return table
+
+_TOKEN_DISPATCH = _make_token_dispatch()
+
+
 class PDFParser():
     """Does the hard work of parsing low-level code into PDF objects.
-    
+
     :param file: file-like object to read bytes from.
     """
     def __init__(self, file):
         self._pbs = PullBytesStream(file)
-        self._parsers = [BooleanParser(), ParseObjectId(), NumericParser(),
-                StringParser(), ParseDictionary(), HexStringParser(),
-                ParseName(), ParseNull(), ParseArray()]
 
     def __iter__(self):
         consumers = []
@@ -508,7 +508,10 @@ class PDFParser():
                 yield obj
 
     def _find_parser(self):
-        for p in self._parsers:
+        first = self._pbs[0:1]
+        if len(first) == 0:
+            return None, None, None
+        for p in _TOKEN_DISPATCH.get(first[0], ()):
             result = p.parse(self._pbs)
             if result is None:
                 continue
@@ -8,12 +8,13 @@ will break.
 
 from .pdf import *
 import io as _io
+import mmap as _mmap
 from .pdf_parser import PDFParser, PullBytesStream, StreamParser, ParseDictionary
 
-_EOL_SET = {b"\n", b"\r"}
-_WHITESPACE_SET = {b"\x00", b"\x09", b"\x0a", b"\x0c", b"\x0d", b"\x20"}
+_EOL_SET = frozenset((0x0a, 0x0d))
+_WHITESPACE_SET = frozenset((0x00, 0x09, 0x0a, 0x0c, 0x0d, 0x20))
 _DELIMITERS = b"()<>[]{}/%"
-_DIGITS = b"0123456789"
+_DIGITS = frozenset(range(0x30, 0x3a))
 
 class PDFLineReader():
     """Wraps a file-like object and allows reading "lines" in the meaning of
@@ -23,9 +24,9 @@ class PDFLineReader():
       should be a `bytes` object.
     """
     def __init__(self, file):
-        try:
+        if isinstance(file, (bytes, bytearray, memoryview)):
             self._file = _io.BytesIO(file)
-        except TypeError:
+        else:
             self._file = file
 
     def read(self, n=-1):
@@ -36,30 +37,33 @@ class PDFLineReader():
     def readline(self):
         """Read a line using the PDF convention for when a line stops."""
         location = self._file.tell()
-        chunk_size = 1024
-        data = b""
+        # Most lines are tiny, so start with a small read and grow; each
+        # chunk is scanned for the end of line markers with C-level find.
+        chunk_size = 128
+        data = bytearray()
         while True:
             x = self._file.read(chunk_size)
+            chunk_size = min(chunk_size * 2, 65536)
             if len(x) == 0:
                 break
             i1 = x.find(b"\x0d")
             i2 = x.find(b"\x0a")
             if i1 != -1 or i2 != -1:
                 if i1 == -1:
-                    data = data + x[:i2+1]
+                    data += x[:i2+1]
                     break
                 elif i2 == -1:
-                    data = data + x[:i1+1]
+                    data += x[:i1+1]
                     break
                 elif i2 == i1 + 1:
-                    data = data + x[:i1+2]
+                    data += x[:i1+2]
                     break
                 else:
-                    data = data + x[:min(i1, i2)+1]
+                    data += x[:min(i1, i2)+1]
                     break
-            data = data + x
+            data += x
         self._file.seek(location + len(data))
-        return data
+        return bytes(data)
 
 
 class PDFLineReaderComments(PDFLineReader):
@@ -88,23 +92,70 @@ class PDFLineReaderComments(PDFLineReader):
         return self._last_line
 
 
+_WS_TABLE = bytearray(range(256))
+for _c in _WHITESPACE_SET:
+    _WS_TABLE[_c] = 0x20
+_WS_TABLE = bytes(_WS_TABLE)
+
 def split_by_whitespace(line):
     """Convert the passed `line` into an array of bytes objects, splitting on
     the PDF notion of whitespace."""
-    out = []
-    index = 0
-    current_token = b""
-    while index < len(line):
-        if line[index:index+1] in _WHITESPACE_SET:
-            if len(current_token) > 0:
-                out.append(current_token)
-                current_token = b""
-        else:
-            current_token += line[index:index+1]
-        index += 1
-    if len(current_token) > 0:
-        out.append(current_token)
-    return out
+    return [token for token in line.translate(_WS_TABLE).split(b" ") if token]
+
+
+class PDFXrefLookup():
+    """Dictionary-like view of the cross-reference table, mapping
+    :class:`PDFObjectId` instances to locations in the file.  Rows of the
+    table are only decoded on demand, so opening a file with a very large
+    table does not parse every entry when only a few objects will be read.
+
+    :param sections: List of pairs `(start, rows)` where `start` is the number
+      of the first object in the subsection, and `rows` is a list of the raw
+      xref records, stripped of end of line markers.
+    """
+    def __init__(self, sections):
+        self._sections = sections
+        self._cache = dict()
+
+    @staticmethod
+    def _decode_row(row):
+        location, generation, ty = row.split(b" ")
+        return int(location), int(generation), ty
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        for start, rows in self._sections:
+            index = key.number - start
+            if index < 0 or index >= len(rows):
+                continue
+            location, generation, ty = self._decode_row(rows[index])
+            if ty == b"n" and generation == key.generation:
+                self._cache[key] = location
+                return location
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def items(self):
+        """Generator of pairs `(object_id, location)`, decoding every row."""
+        for start, rows in self._sections:
+            for offset, row in enumerate(rows):
+                location, generation, ty = self._decode_row(row)
+                if ty == b"n":
+                    yield PDFObjectId(start + offset, generation), location
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def __iter__(self):
+        return self.keys()
 
 
 class PDF():
@@ -115,13 +166,26 @@ class PDF():
     """
     def __init__(self, file):
         try:
-            self._file = open(file, "rb")
+            handle = open(file, "rb")
         except TypeError:
             self._file = file
+        else:
+            try:
+                # Memory-map the file so random access to objects only pages
+                # in what is actually touched; the mmap object supports the
+                # same read/seek/tell interface we use on files.
+                self._file = _mmap.mmap(handle.fileno(), 0, access=_mmap.ACCESS_READ)
+                handle.close()
+            except (ValueError, OSError):
+                self._file = handle
 
         self._validate()
         self._read_tail()
 
+    def close(self):
+        """Close the underlying file or memory map."""
+        self._file.close()
+
     @property
     def version(self):
         """The version string of the PDF file."""
@@ -134,18 +198,17 @@ class PDF():
 
     @property
     def object_lookup(self):
-        """Dictionary from :class:`PDFObjectId` objects to location"""
+        """Dictionary-like object from :class:`PDFObjectId` objects to
+        location; see :class:`PDFXrefLookup`."""
         return self._obj_lookup
 
     def _decimal_number_from(self, data):
-        out = b""
         i = 0
-        while len(data) > i and data[i:i+1] in _DIGITS:
-            out += data[i:i+1]
+        while len(data) > i and data[i] in _DIGITS:
             i += 1
-        if len(out) == 0:
+        if i == 0:
             return None
-        return out
+        return data[:i]
 
     def _parse_object_header(self, stream):
         stream.skip_whitespace()
@@ -180,7 +243,7 @@ class PDF():
         header = self._parse_object_header(stream)
         if header is None:
             raise ValueError("Line at {} not an object definition".format(location))
-        obj_id, gen_id = [int(x.decode()) for x in header]
+        obj_id, gen_id = [int(x) for x in header]
 
         p = PDFParser(self._file)
         objects = list(p)
@@ -224,51 +287,84 @@ class PDF():
             return PDFStream(list(obj.items()), stream.contents)
         return obj
 
+    def _resolve_references(self, object_ids):
+        """Resolve each :class:`PDFObjectId` to its fully populated object.
+        Objects are read in increasing file location order, so clusters of
+        adjacent objects (e.g. `/Kids` entries) are read sequentially rather
+        than with random seeks.
+
+        :return: Dictionary from the ids to objects.
+        """
+        resolved = dict()
+        with_locations = []
+        for obj_id in object_ids:
+            if obj_id in resolved:
+                continue
+            if obj_id not in self.object_lookup:
+                resolved[obj_id] = PDFNull()
+            else:
+                resolved[obj_id] = None
+                with_locations.append((self.object_lookup[obj_id], obj_id))
+        with_locations.sort(key = lambda pair : pair[0])
+        for location, obj_id in with_locations:
+            resolved[obj_id] = self.full_object_at(location)
+        return resolved
+
     def _recurse_populate(self, obj):
         def should_recurse(obj):
             return isinstance(obj, PDFArray) or isinstance(obj, PDFDictionary)
-        
+
+        if isinstance(obj, PDFArray):
+            children = list(obj)
+        elif isinstance(obj, PDFDictionary):
+            children = [v for _, v in obj.items()]
+        else:
+            return obj
+        resolved = self._resolve_references(
+            ob for ob in children if isinstance(ob, PDFObjectId))
+
         def make_new_object(old_obj):
             if isinstance(old_obj, PDFObjectId):
-                if old_obj not in self.object_lookup:
-                    return PDFNull()
-                location = self.object_lookup[old_obj]
-                return self.full_object_at(location)
+                return resolved[old_obj]
             elif should_recurse(old_obj):
                 return self._recurse_populate(old_obj)
             return old_obj
-        
+
         if isinstance(obj, PDFArray):
-            return PDFArray([make_new_object(ob) for ob in obj])
-        if isinstance(obj, PDFDictionary):
-            return PDFDictionary([(k, make_new_object(ob)) for k, ob in obj.items()])
-        return obj
+            return PDFArray([make_new_object(ob) for ob in children])
+        return PDFDictionary([(k, make_new_object(ob)) for k, ob in obj.items()])
+
+    _TAIL_MARKERS = (b"%%EOF", b"startxref", b"trailer")
 
-    def _tail(self, chunk_size = 2048):
-        """Return a chunk at the end of the file."""
+    def _tail(self, chunk_size = 4096):
+        """Return a chunk at the end of the file, large enough to contain the
+        `%%EOF`, `startxref` and `trailer` markers.  Starts with `chunk_size`
+        bytes and doubles until all markers are found, or the whole file has
+        been read."""
         self._file.seek(0, 2)
         file_length = self._file.tell()
-        if file_length <= chunk_size:
-            self._file.seek(0)
-            return self._file.read()
-        self._file.seek(-chunk_size, 2)
-        return self._file.read()
+        while True:
+            if file_length <= chunk_size:
+                self._file.seek(0)
+                return self._file.read()
+            self._file.seek(-chunk_size, 2)
+            data = self._file.read()
+            if all(marker in data for marker in self._TAIL_MARKERS):
+                return data
+            chunk_size *= 2
 
     @staticmethod
     def is_end_of_line(data, offset):
-        return data[offset:offset+1] in _EOL_SET
+        return offset < len(data) and data[offset] in _EOL_SET
 
     @staticmethod
     def find_last_occurance(data, bytes):
-        reversed_data = data[::-1]
-        reversed_index = -1
-        while True:
-            reversed_index = reversed_data.find(bytes[::-1], reversed_index+1)
-            if reversed_index == -1:
-                return -1
-            index = len(data) - reversed_index - len(bytes)
+        index = data.rfind(bytes)
+        while index != -1:
             if PDF.is_end_of_line(data, index + len(bytes)):
                 return index
+            index = data.rfind(bytes, 0, index)
+        return -1
 
     def _read_tail(self):
         data = self._tail()
@@ -280,7 +376,7 @@ class PDF():
 
         trailer_index = self.find_last_occurance(data[:eof_index], b"trailer")
         parser = PDFParser(_io.BytesIO(data[trailer_index+7:]))
-        self._trailer_dictionary = list(parser)[0]
+        self._trailer_dictionary = next(iter(parser))
         if PDFName("Prev") in self._trailer_dictionary:
             raise ValueError("Files with more than one cross-reference not currently supported")
 
@@ -291,26 +387,21 @@ class PDF():
         lr = PDFLineReaderComments(self._file)
         if lr.readline().strip() != b"xref":
             raise ValueError("Didn't find xref at {}", offset)
-        objects = []
+        sections = []
         while True:
             line = lr.readline().strip()
             try:
-                start, count = [int(x) for x in line.decode().split(" ")]
+                start, count = [int(x) for x in line.split(b" ")]
             except:
                 break
-            for row in range(count):
-                line = lr.readline().strip()
-                location, generation, ty = line.decode().split(" ")
-                location = int(location)
-                generation = int(generation)
-                if ty == "n":
-                    objects.append((row+start, location, generation))
-        self._obj_lookup = {PDFObjectId(n, g) : loc for n, loc, g in objects}
+            rows = [lr.readline().strip() for _ in range(count)]
+            sections.append((start, rows))
+        self._obj_lookup = PDFXrefLookup(sections)
 
     def _validate(self):
         self._file.seek(0)
         data = self._file.read(9)
-        if not data[:5] == b"%PDF-" or data[-1:] not in _WHITESPACE_SET:
+        if not data[:5] == b"%PDF-" or len(data) < 9 or data[8] not in _WHITESPACE_SET:
             raise ValueError("Initial byte marker {} is not a PDF file".format(data))
         self._version = data[:8].decode()
 
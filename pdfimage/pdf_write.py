@@ -8,6 +8,8 @@ Supports writing (simple) PDF files.
 from .pdf import *
 import datetime as _datetime
 import hashlib as _hashlib
+import itertools as _itertools
+import io as _io
 
 class DocumentEntity():
     """Base class for each typed document member."""
@@ -40,12 +42,15 @@ class PageTree(DocumentEntity):
     each page will have its "parent" set to the generated object."""
     def __init__(self):
         self._pages = []
+        self._pages_object = None
 
     def add_page(self, page):
         """Add a :class:`Page` object."""
         self._pages.append(page)
 
     def object(self):
+        if self._pages_object is not None:
+            return self._pages_object
         pages_object = PDFObject()
 
         out = PDFSimpleDict()
@@ -58,6 +63,7 @@ class PageTree(DocumentEntity):
         out["Count"] = len(pages)
         pages_object.data = out.to_dict()
 
+        self._pages_object = pages_object
         return pages_object
 
 
@@ -87,6 +93,8 @@ class Page(DocumentEntity):
         self._parent = p
 
     def object(self):
+        if self._object.data is not None:
+            return self._object
         out = PDFSimpleDict()
         out["Type"] = "Page"
         out["Parent"] = self._parent
@@ -141,19 +149,30 @@ class ColourSpaceIndexed(ColourSpace):
     of 256 entries.
 
     :param palette: An iterable of 256 tuples specifying RGB values (between 0
-      and 255 inclusive).
+      and 255 inclusive), or the 768 palette bytes directly.
     """
     def __init__(self, palette):
-        self._palette = [tuple(x) for x in palette]
+        if isinstance(palette, (bytes, bytearray)):
+            flat_palette = bytes(palette)
+        else:
+            flat_palette = bytes(_itertools.chain.from_iterable(palette))
+        self._value = PDFArray([PDFName("Indexed"), PDFName("DeviceRGB"),
+                PDFNumeric(255), PDFString(flat_palette)])
 
     def __call__(self):
-        ar = [PDFName("Indexed"), PDFName("DeviceRGB"), PDFNumeric(255)]
-        flat_palette = []
-        for rgb in self._palette:
-            for comp in rgb:
-                flat_palette.append(comp)
-        ar.append(PDFString(flat_palette))
-        return PDFArray(ar)
+        return self._value
+
+
+_NAME_SUBTYPE = PDFName("Subtype")
+_NAME_IMAGE = PDFName("Image")
+_NAME_WIDTH = PDFName("Width")
+_NAME_HEIGHT = PDFName("Height")
+_NAME_COLOR_SPACE = PDFName("ColorSpace")
+_NAME_BITS_PER_COMPONENT = PDFName("BitsPerComponent")
+_NAME_INTERPOLATE = PDFName("Interpolate")
+_NAME_FILTER = PDFName("Filter")
+_NAME_LENGTH = PDFName("Length")
+_NAME_DECODE_PARMS = PDFName("DecodeParms")
 
 
 class ImageDictionary(DocumentEntity):
@@ -196,21 +215,21 @@ class ImageDictionary(DocumentEntity):
 
     def object(self):
         out = PDFSimpleDict()
-        out["Subtype"] = "Image"
-        out["Width"] = self._size[0]
-        out["Height"] = self._size[1]
-        out["ColorSpace"] = self._cs()
-        out["BitsPerComponent"] = self._bpc
+        out[_NAME_SUBTYPE] = _NAME_IMAGE
+        out[_NAME_WIDTH] = self._size[0]
+        out[_NAME_HEIGHT] = self._size[1]
+        out[_NAME_COLOR_SPACE] = self._cs()
+        out[_NAME_BITS_PER_COMPONENT] = self._bpc
         if self._interpolate:
-            out["Interpolate"] = PDFBoolean(self._interpolate)
+            out[_NAME_INTERPOLATE] = PDFBoolean(self._interpolate)
         if self._filter is not None:
-            out["Filter"] = self._filter
-        out["Length"] = len(self._data)
+            out[_NAME_FILTER] = self._filter
+        out[_NAME_LENGTH] = len(self._data)
         if self._params is not None:
             params = PDFSimpleDict()
             for k, v in self._params.items():
                 params[k] = v
-            out["DecodeParms"] = params.to_dict()
+            out[_NAME_DECODE_PARMS] = params.to_dict()
         for k, v in self._extra_entries.items():
             out[k] = v
         stream = PDFStream(out.to_dict().items(), self._data)
@@ -226,45 +245,42 @@ class ImageTransformation():
 class ImageScale(ImageTransformation):
     """Scale an image."""
     def __init__(self, xscale=1.0, yscale=1.0):
-        self._x = xscale
-        self._y = yscale
+        self._command = "{} 0 0 {} 0 0 cm".format(xscale, yscale)
 
     def __call__(self):
-        return "{} 0 0 {} 0 0 cm".format(self._x, self._y)
+        return self._command
 
 
 class ImageTranslation(ImageTransformation):
     """Translate an image."""
     def __init__(self, x=0, y=0):
-        self._x = x
-        self._y = y
+        self._command = "1 0 0 1 {} {} cm".format(x, y)
 
     def __call__(self):
-        return "1 0 0 1 {} {} cm".format(self._x, self._y)
+        return self._command
 
 
 class ImageDrawer(DocumentEntity):
     """The object which transforms and draws the image.  Will be the "contents"
-    of a page.
-    
+    of a page.  The content stream is formatted once, on construction.
+
     :param transformations: Iterable of :class:`ImageTransformation` objects.
     :param image_name: Name of the image.
     """
     def __init__(self, transformations, image_name):
-        self._trans = transformations
-        self._image_name = image_name
+        data = [b"q"] + [x().encode() for x in transformations]
+        data.append(bytes(PDFName(image_name)) + b" Do")
+        data.append(b"Q")
+        self._stream = b"\n".join(data)
 
     def make_stream(self):
         """Make the raw stream; useful for combining more than one drawing
         command in a single PDF object."""
-        data = [b"q"] + [x().encode() for x in self._trans]
-        data.append(bytes(PDFName(self._image_name)) + b" Do")
-        data.append(b"Q")
-        return b"\n".join(data)
+        return self._stream
 
     def object(self):
         data = self.make_stream()
-        obj = PDFStream([(PDFName("Length"), PDFNumeric(len(data)))], data)
+        obj = PDFStream([], data)
         return PDFObject(obj)
 
 
@@ -289,12 +305,10 @@ class CommonDataStructure():
 class Rectangle(CommonDataStructure):
     """A rectangle"""
     def __init__(self, xmin, ymin, xmax, ymax):
-        self._min = (xmin, ymin)
-        self._max = (xmax, ymax)
+        self._array = PDFArray([PDFNumeric(x) for x in (xmin, ymin, xmax, ymax)])
 
     def __call__(self):
-        coords = (*self._min, *self._max)
-        return PDFArray([PDFNumeric(x) for x in coords])
+        return self._array
 
 
 class DateTime(CommonDataStructure):
@@ -306,18 +320,18 @@ class DateTime(CommonDataStructure):
     def __init__(self, dt):
         self._dt = dt
 
+    _FIELDS = ("year", "month", "day", "hour", "minute", "second")
+    _FORMATS = tuple(b"D:%04d" + b"%02d" * n for n in range(6))
+
     def __call__(self):
-        fields = [("year", "{:04}"), ("month", "{:02}"), ("day", "{:02}"),
-                ("hour", "{:02}"), ("minute", "{:02}"), ("second", "{:02}")
-                ]
-        out = b"D:"
-        for field, fmt in fields:
-            if hasattr(self._dt, field):
-                x = int(getattr(self._dt, field))
-                out += fmt.format(x).encode()
-            else:
+        values = []
+        for field in self._FIELDS:
+            if not hasattr(self._dt, field):
                 break
-        return PDFString(out)
+            values.append(int(getattr(self._dt, field)))
+        if len(values) == 0:
+            return PDFString(b"D:")
+        return PDFString(self._FORMATS[len(values) - 1] % tuple(values))
 
 
 class PDFWriter():
@@ -351,6 +365,17 @@ class PDFWriter():
         self._objs.append(obj)
         return obj
 
+    def add_pdf_objects(self, objs):
+        """Add each object in the iterable `objs`; see :meth:`add_pdf_object`.
+
+        :return: List of the objects, made into :class:`PDFObject` instances
+          if necessary.
+        """
+        objs = [obj if isinstance(obj, PDFObject) else PDFObject(obj)
+                for obj in objs]
+        self._objs.extend(objs)
+        return objs
+
     def set_info_object(self, info):
         """Set the :class:`InfoObject` instance."""
         self._info = info
@@ -376,38 +401,60 @@ class PDFWriter():
     def _obj_marker(self, obj):
         return "{} {} obj".format(obj.number, obj.generation).encode()
 
-    def _make_trailer(self, object_count, hash_data):
+    def _make_trailer(self, object_count, hash_digest):
         out = b"trailer\n"
         trailer = PDFSimpleDict()
         trailer["Size"] = object_count
         trailer["Root"] = self._root_object
         trailer["Info"] = self._info_object
-        h = _hashlib.md5(hash_data).digest()
-        trailer["ID"] = PDFArray([PDFString(h), PDFString(h)])
+        trailer["ID"] = PDFArray([PDFString(hash_digest), PDFString(hash_digest)])
         out += bytes(trailer.to_dict()) + b"\n"
         return out
 
-    def __bytes__(self):
-        out = b"%PDF-1.4\n"
-
+    def write_to(self, file):
+        """Write the PDF file directly to `file`, a file-like object opened in
+        binary mode.  Unlike `bytes(writer)`, the whole document is never
+        serialised in memory; peak usage is bounded by the largest single
+        object."""
+        # The /ID entry is just a file identifier, not a security hash, so we
+        # are free to use the fastest 16-byte digest available.
+        hasher = _hashlib.blake2b(digest_size=16)
+        position = 0
+        def write(chunk):
+            nonlocal position
+            file.write(chunk)
+            hasher.update(chunk)
+            position += len(chunk)
+
+        write(b"%PDF-1.4\n")
         offsets = dict()
         all_objects = self._to_full_objects()
+        scratch = bytearray()
         for obj in all_objects:
-            offsets[obj.number] = len(out)
-            out += self._obj_marker(obj) + b"\n"
-            out += bytes(obj.data) + b"\n"
-            out += b"endobj\n"
+            offsets[obj.number] = position
+            scratch.clear()
+            scratch += self._obj_marker(obj)
+            scratch += b"\n"
+            data = obj.data
+            if hasattr(data, "write_to"):
+                data.write_to(scratch)
+            else:
+                scratch += bytes(data)
+            scratch += b"\nendobj\n"
+            write(scratch)
         offsets = list(offsets.items())
         offsets.sort(key = lambda pr : pr[0])
         offsets = [v for k, v in offsets]
 
-        start_xref = len(out)
-        out += "xref\n0 {}\n".format(len(offsets) + 1).encode()
-        out += b"0000000000 65535 f \n"
-        for off in offsets:
-            out += "{:010} 00000 n \n".format(off).encode()
-        
-        out += self._make_trailer(len(offsets) + 1, out)
+        start_xref = position
+        write(b"xref\n0 %d\n" % (len(offsets) + 1))
+        write(b"0000000000 65535 f \n")
+        write(b"".join(b"%010d 00000 n \n" % off for off in offsets))
 
-        out += "startxref\n{}\n%%EOF\n".format(start_xref).encode()
-        return out
+        file.write(self._make_trailer(len(offsets) + 1, hasher.digest()))
+        file.write("startxref\n{}\n%%EOF\n".format(start_xref).encode())
+
+    def __bytes__(self):
+        buf = _io.BytesIO()
+        self.write_to(buf)
+        return buf.getvalue()
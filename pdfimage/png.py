@@ -6,7 +6,7 @@ Load and save PNG files in PDF.
 """
 
 import PIL.Image
-import zlib, enum, array
+import zlib, enum
 import numpy as np
 
 class PNGPredictor(enum.Enum):
@@ -22,6 +22,16 @@ class PNGPredictor(enum.Enum):
     heuristic = 1000
 
 
+_ZERO_ROW = np.zeros(4096, dtype=np.uint8)
+
+def _zero_row(w):
+    """A shared, read-only row of `w` zero bytes; grown lazily as needed."""
+    global _ZERO_ROW
+    if len(_ZERO_ROW) < w:
+        _ZERO_ROW = np.zeros(w, dtype=np.uint8)
+    return _ZERO_ROW[:w]
+
+
 class PNG():
     """Encode image files using different PNG "predictors".
 
@@ -31,7 +41,11 @@ class PNG():
         self.width = image.width
         self.height = image.height
         self.bpp = self._bpp(image)
-        self.bytes = array.array("B", image.tobytes())
+        data = np.asarray(image)
+        if data.dtype != np.uint8:
+            data = np.frombuffer(image.tobytes(), dtype=np.uint8)
+        self._rows = data.reshape(self.height, -1)
+        self.bytes = self._rows.reshape(-1)
     
     def _bpp(self, image):
         if image.mode == "RGB":
@@ -43,69 +57,35 @@ class PNG():
 
     def png_sub(self, row):
         """Encode the row using the sub method."""
-        out = array.array("B")
-        if self.bpp == 1:
-            past = 0
-            for i in range(self.width):
-                pixel, past = row[i] - past, row[i]
-                if pixel < 0:
-                    pixel += 256
-                out.append(pixel)
-        elif self.bpp == 3:
-            index = 0
-            past = [0, 0, 0]
-            for _ in range(self.width):
-                for i in range(3):
-                    pixel = row[index + i]
-                    pixel, past[i] = pixel - past[i], pixel
-                    if pixel < 0:
-                        pixel += 256
-                    out.append(pixel)
-                index += 3
-        else:
-            raise ValueError()
-        return out
+        row = np.asarray(row, dtype=np.int16)
+        diffs = row.copy()
+        diffs[self.bpp:] -= row[:-self.bpp]
+        return (diffs & 0xFF).astype(np.uint8)
 
     def png_up(self, row, rowup):
         """Encode the row using the up method."""
-        out = array.array("B")
-        for x, y in zip(row, rowup):
-            d = x - y
-            if d < 0:
-                d += 256
-            out.append(d)
-        return out
+        row = np.asarray(row, dtype=np.int16)
+        rowup = np.asarray(rowup, dtype=np.int16)
+        return ((row - rowup) & 0xFF).astype(np.uint8)
 
     def png_avg(self, row, rowup):
         """Encode the row using the average method."""
-        out = array.array("B")
-        for i, (x, y) in enumerate(zip(row, rowup)):
-            if i < self.bpp:
-                old = 0
-            else:
-                old = row[i - self.bpp]
-            pred = x - (old + y) // 2
-            if pred < 0:
-                pred += 256
-            out.append(pred)
-        return out
+        row = np.asarray(row, dtype=np.int16)
+        rowup = np.asarray(rowup, dtype=np.int16)
+        old = np.zeros_like(row)
+        old[self.bpp:] = row[:-self.bpp]
+        return ((row - (old + rowup) // 2) & 0xFF).astype(np.uint8)
 
     def png_paeth(self, row, rowup):
         """Encode the row using the "paeth" method."""
-        out = array.array("B")
-        for i in range(len(row)):
-            if i < self.bpp:
-                a = 0
-                c = 0
-            else:
-                a = row[i - self.bpp]
-                c = rowup[i - self.bpp]
-            b = rowup[i]
-            diff = row[i] - self.paeth(a, b, c)
-            if diff < 0:
-                diff += 256
-            out.append(diff)
-        return out
+        row = np.asarray(row, dtype=np.int16)
+        rowup = np.asarray(rowup, dtype=np.int16)
+        rowoffset = np.zeros_like(row)
+        rowoffset[self.bpp:] = row[:-self.bpp]
+        rowupoffset = np.zeros_like(rowup)
+        rowupoffset[self.bpp:] = rowup[:-self.bpp]
+        p = self.paeth_parallel(rowoffset, rowup, rowupoffset)
+        return ((row - p) & 0xFF).astype(np.uint8)
 
     @staticmethod
     def paeth(a, b, c):
@@ -120,10 +100,26 @@ class PNG():
             return b
         return c
 
-    def _row_up(self, row_number, w):
+    @staticmethod
+    def paeth_parallel(a, b, c):
+        """Implements the "paeth" transform on whole rows at once.  Reuses
+        intermediate buffers where possible, to limit memory traffic."""
+        a = np.asarray(a, dtype=np.int16)
+        b = np.asarray(b, dtype=np.int16)
+        c = np.asarray(c, dtype=np.int16)
+        pa = b - c
+        pb = a - c
+        pc = np.abs(pa + pb)
+        np.abs(pa, out=pa)
+        np.abs(pb, out=pb)
+        amask = (pa <= pb) & (pa <= pc)
+        bmask = pb <= pc
+        return np.where(amask, a, np.where(bmask, b, c))
+
+    def _row_up(self, row_number):
         if row_number == 0:
-            return array.array("B", [0]) * w
-        return self.bytes[(row_number - 1) * w : row_number * w]
+            return _zero_row(self._rows.shape[1])
+        return self._rows[row_number - 1]
 
     def heuristic(self, row, rowup):
         raise NotImplementedError("Use `PNGFast`")
@@ -134,23 +130,22 @@ class PNG():
         :param row_number: Which row to encode
         :param predict_type: Which :class:`PNGPredictor` to use.
 
-        :return: Encodes row of bytes, as an `array`.
+        :return: Encoded row of bytes, as a `numpy` array.
         """
-        w = self.width * self.bpp
-        row = self.bytes[row_number * w : (row_number + 1) * w]
-        
+        row = self._rows[row_number]
+
         if predict_type == PNGPredictor.none:
             return row
         if predict_type == PNGPredictor.sub:
             return self.png_sub(row)
         if predict_type == PNGPredictor.up:
-            return self.png_up(row, self._row_up(row_number, w))
+            return self.png_up(row, self._row_up(row_number))
         if predict_type == PNGPredictor.average:
-            return self.png_avg(row, self._row_up(row_number, w))
+            return self.png_avg(row, self._row_up(row_number))
         if predict_type == PNGPredictor.paeth:
-            return self.png_paeth(row, self._row_up(row_number, w))
+            return self.png_paeth(row, self._row_up(row_number))
         if predict_type == PNGPredictor.heuristic:
-            return self.heuristic(row, self._row_up(row_number, w))
+            return self.heuristic(row, self._row_up(row_number))
         raise ValueError()
 
 
@@ -163,19 +158,21 @@ class PNGFast(PNG):
     def __init__(self, image):
         super().__init__(image)
 
+    def _offset(self, row):
+        """The row shifted right by one pixel, zero padded at the start."""
+        out = np.zeros_like(row)
+        out[self.bpp:] = row[:-self.bpp]
+        return out
+
     def signed_filter(self, row, rowup):
         """Returns the resulting of the "filtering"/"predicting" step for
         "none", "sub", "up", "average", "paeth" but as signed numpy arrays.
         """
+        row = np.asarray(row, dtype=np.int16)
+        rowup = np.asarray(rowup, dtype=np.int16)
+        rowoffset = self._offset(row)
+        rowupoffset = self._offset(rowup)
         out = []
-        data = array.array("B", [0] * self.bpp)
-        data.extend(row)
-        rowoffset = np.asarray(data, dtype=np.int)[:-self.bpp]
-        data = array.array("B", [0] * self.bpp)
-        data.extend(rowup)
-        rowupoffset = np.asarray(data, dtype=np.int)[:-self.bpp]
-        row = np.asarray(row, dtype=np.int)
-        rowup = np.asarray(rowup, dtype=np.int)
         out.append(row)
         out.append(row - rowoffset)
         out.append(row - rowup)
@@ -188,64 +185,71 @@ class PNGFast(PNG):
         signed = self.signed_filter(row, rowup)
         score = [np.sum(np.abs(x)) for x in signed]
         index = score.index(min(score))
-        return index, signed[index].astype(np.uint8)
+        return index, (signed[index] & 0xFF).astype(np.uint8)
 
-    def png_sub(self, row):
-        data = array.array("B", [0] * self.bpp)
-        data.extend(row)
-        row = np.asarray(data)
-        diffs = row[self.bpp:] - row[:-self.bpp]
-        return diffs
+    def heuristic_all_rows(self):
+        """Compute the "heuristic" filter choice for every row of the image
+        in one batched pass, instead of filtering row by row.
 
-    def png_up(self, row, rowup):
-        diffs = np.asarray(row) - np.asarray(rowup)
-        return diffs
-
-    def png_avg(self, row, rowup):
-        row = np.asarray(row)
-        old = np.empty_like(row)
-        for i in range(self.bpp):
-            old[i] = 0
-        old[self.bpp:] = row[:-self.bpp]
-        diffs = row - (old.astype(np.int) + np.asarray(rowup)) // 2
-        diffs[diffs < 0] += 256
-        return diffs
+        :return: Pair `(choices, filtered)` where `choices` gives the filter
+          number chosen for each row, and `filtered` is the `(height,
+          width*bpp)` array of filtered rows, as unsigned bytes.
+        """
+        img = self._rows.astype(np.int16)
+        up = np.zeros_like(img)
+        up[1:] = img[:-1]
+        left = np.zeros_like(img)
+        left[:, self.bpp:] = img[:, :-self.bpp]
+        upleft = np.zeros_like(up)
+        upleft[:, self.bpp:] = up[:, :-self.bpp]
+        filters = np.stack([img, img - left, img - up,
+                img - (left + up) // 2,
+                img - self.paeth_parallel(left, up, upleft)])
+        scores = np.abs(filters).sum(axis=2)
+        choices = scores.argmin(axis=0)
+        filtered = filters[choices, np.arange(self.height)]
+        return choices, (filtered & 0xFF).astype(np.uint8)
 
-    def png_paeth(self, row, rowup):
-        data = array.array("B", [0] * self.bpp)
-        data.extend(row)
-        rowoffset = np.asarray(data, dtype=np.int)[:-self.bpp]
-        data = array.array("B", [0] * self.bpp)
-        data.extend(rowup)
-        rowupoffset = np.asarray(data, dtype=np.int)[:-self.bpp]
-        p = self.paeth_parallel(rowoffset, rowup, rowupoffset).astype(np.uint8)
-        return np.asarray(row) - p
-
-    @staticmethod
-    def paeth_parallel(a, b, c):
-        a = np.asarray(a, dtype=np.int)
-        b = np.asarray(b, dtype=np.int)
-        c = np.asarray(c, dtype=np.int)
-        pa, pb = b - c, a - c
-        pc = np.abs(pa + pb)
-        pa, pb = np.abs(pa), np.abs(pb)
-        amask = (pa <= pb) & (pa <= pc)
-        bmask = (~amask) & (pb <= pc)
-        cmask = (~amask) & (~bmask)
-        return a * amask + b * bmask + c * cmask
 
 def png_heuristic_predictor(image):
-    out = array.array("B")
     png = PNGFast(image)
-    for row in range(image.height):
-        filter_num, data = png.png_predict(row, PNGPredictor.heuristic)
-        out.append( filter_num )
-        out.extend( data )
+    choices, filtered = png.heuristic_all_rows()
+    out = np.empty((png.height, 1 + filtered.shape[1]), dtype=np.uint8)
+    out[:, 0] = choices
+    out[:, 1:] = filtered
+    return out.tobytes()
+
+def png_heuristic_predictor_compressed(image, level=9):
+    """As :func:`png_heuristic_predictor`, but Flate compresses the result,
+    feeding each filtered row to :class:`zlib.compressobj` as it is selected
+    rather than concatenating the rows into one bytes string first."""
+    png = PNGFast(image)
+    choices, filtered = png.heuristic_all_rows()
+    compressor = zlib.compressobj(level)
+    out = bytearray()
+    for filter_num, data in zip(choices, filtered):
+        out += compressor.compress(bytes([filter_num]))
+        out += compressor.compress(data.tobytes())
+    out += compressor.flush()
     return bytes(out)
 
+def png_up_predictor_compressed(image, level=9):
+    """Encode every row with the "up" filter and Flate compress the result.
+    Much cheaper to compute than the heuristic filter choice, while usually
+    capturing most of the compression benefit."""
+    png = PNGFast(image)
+    rows = png._rows
+    out = np.empty((png.height, 1 + rows.shape[1]), dtype=np.uint8)
+    out[:, 0] = PNGPredictor.up.value
+    out[0, 1:] = rows[0]
+    out[1:, 1:] = rows[1:] - rows[:-1]
+    return zlib.compress(out.tobytes(), level)
+
 def tiff_predictor(image):
-    out = array.array("B")
     png = PNGFast(image)
-    for row in range(image.height):
-        out.extend( png.png_predict(row, PNGPredictor.sub) )
-    return bytes(out)
+    w = png.width * png.bpp
+    buf = bytearray(png.height * w)
+    view = memoryview(buf)
+    for row in range(png.height):
+        view[row * w : (row + 1) * w] = png.png_predict(row, PNGPredictor.sub).tobytes()
+    return bytes(buf)
@@ -17,7 +17,7 @@ def test_PDFImageParts():
     pdf_writer = mock.Mock()
     parts.add_to_pdf_writer(pdf_writer)
     pdf_writer.add_page.assert_called_with(page)
-    pdf_writer.add_pdf_object.assert_called_with(objects[0])
+    pdf_writer.add_pdf_objects.assert_called_with(objects)
 
 @pytest.fixture
 def test_output_dir():
@@ -39,7 +39,7 @@ def test_UncompressedImage(grey_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "uncompressed_image_grey.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 @pytest.fixture
 def palette_image():
@@ -53,7 +53,7 @@ def test_UncompressedImage_palette(palette_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "uncompressed_image_palette.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 @pytest.fixture
 def blackwhite_image():
@@ -67,7 +67,7 @@ def test_UncompressedImage_bw(blackwhite_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "uncompressed_image_bw.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_UncompressedImage_combine(grey_image, palette_image, blackwhite_image, test_output_dir):
     writer = pdf_write.PDFWriter()
@@ -80,7 +80,7 @@ def test_UncompressedImage_combine(grey_image, palette_image, blackwhite_image,
     parts.add_to_pdf_writer(writer)
 
     with open(os.path.join(test_output_dir, "uncompressed_three_up.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 @pytest.fixture
 def rgb_image():
@@ -94,7 +94,7 @@ def test_UncompressedImage_rgb(rgb_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "uncompressed_image_rgb.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_FlateImage_rgb(rgb_image, test_output_dir):
     image = pdf_image.FlateImage(rgb_image)
@@ -103,7 +103,7 @@ def test_FlateImage_rgb(rgb_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "flate_image_rgb.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_FlateImage(grey_image, test_output_dir):
     image = pdf_image.FlateImage(grey_image)
@@ -112,7 +112,7 @@ def test_FlateImage(grey_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "flate_image_grey.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_PNGImage(grey_image, test_output_dir):
     image = pdf_image.PNGImage(grey_image)
@@ -121,7 +121,7 @@ def test_PNGImage(grey_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "png_image_grey.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_PNGImage_RGB(rgb_image, test_output_dir):
     image = pdf_image.PNGImage(rgb_image)
@@ -130,7 +130,7 @@ def test_PNGImage_RGB(rgb_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "png_image_rgb.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_TIFFImage(grey_image, test_output_dir):
     image = pdf_image.TIFFImage(grey_image)
@@ -139,7 +139,7 @@ def test_TIFFImage(grey_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "tiff_image_grey.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_TIFFImage_RGB(rgb_image, test_output_dir):
     image = pdf_image.TIFFImage(rgb_image)
@@ -148,7 +148,7 @@ def test_TIFFImage_RGB(rgb_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "tiff_image_rgb.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_JPEGImage(grey_image, test_output_dir):
     image = pdf_image.JPEGImage(grey_image, quality=90)
@@ -157,7 +157,7 @@ def test_JPEGImage(grey_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "jpeg_image_grey.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_JPEGImageRaw(grey_image, test_output_dir):
     with io.BytesIO() as file:
@@ -169,7 +169,25 @@ def test_JPEGImageRaw(grey_image, test_output_dir):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "jpeg_raw_image_grey.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
+
+def test_FlateUpImage_rgb(rgb_image, test_output_dir):
+    image = pdf_image.FlateUpImage(rgb_image)
+    parts = image()
+
+    writer = pdf_write.PDFWriter()
+    parts.add_to_pdf_writer(writer)
+    with open(os.path.join(test_output_dir, "flate_up_image_rgb.pdf"), "wb") as f:
+        writer.write_to(f)
+
+def test_JPEGImageRaw_from_image(rgb_image, test_output_dir):
+    image = pdf_image.JPEGImageRaw(rgb_image)
+    parts = image()
+
+    writer = pdf_write.PDFWriter()
+    parts.add_to_pdf_writer(writer)
+    with open(os.path.join(test_output_dir, "jpeg_raw_image_rgb.pdf"), "wb") as f:
+        writer.write_to(f)
 
 def test_Flate_Multiple_Image1(test_output_dir, rgb_image, blackwhite_image):
     image = pdf_image.FlateMultiImage(blackwhite_image)
@@ -179,7 +197,7 @@ def test_Flate_Multiple_Image1(test_output_dir, rgb_image, blackwhite_image):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "multi_flate_1.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
     
 def test_Flate_Multiple_Image2(test_output_dir, rgb_image, blackwhite_image):
     image = pdf_image.FlateMultiImage(rgb_image)
@@ -189,7 +207,7 @@ def test_Flate_Multiple_Image2(test_output_dir, rgb_image, blackwhite_image):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "multi_flate_2.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_Flate_Multiple_Image3(test_output_dir, rgb_image, blackwhite_image):
     image = pdf_image.FlateMultiImage(rgb_image)
@@ -199,7 +217,7 @@ def test_Flate_Multiple_Image3(test_output_dir, rgb_image, blackwhite_image):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "multi_flate_3.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
 
 def test_Flate_Multiple_Image4(test_output_dir, rgb_image, grey_image):
     image = pdf_image.FlateMultiImage(rgb_image)
@@ -209,4 +227,4 @@ def test_Flate_Multiple_Image4(test_output_dir, rgb_image, grey_image):
     writer = pdf_write.PDFWriter()
     parts.add_to_pdf_writer(writer)
     with open(os.path.join(test_output_dir, "multi_flate_4.pdf"), "wb") as f:
-        f.write(bytes(writer))
+        writer.write_to(f)
@@ -157,6 +157,19 @@ def test_PDFDictionary():
     x[pdf.PDFName("Bob")] = pdf.PDFNumeric(1)
     assert bytes(x) == b"<</Bob 1>>"
 
+def test_PDFDictionary_key_bytes():
+    x = pdf.PDFDictionary([(pdf.PDFName("Bob"), pdf.PDFNumeric(12))])
+    assert x.key_bytes() == {b"/Bob"}
+
+    x[pdf.PDFName("Type")] = pdf.PDFName("Page")
+    assert x.key_bytes() == {b"/Bob", b"/Type"}
+
+    del x[pdf.PDFName("Bob")]
+    assert x.key_bytes() == {b"/Type"}
+
+    y = pdf.PDFStream([], b"abcdfgiqsp")
+    assert y.key_bytes() == {b"/Length"}
+
 def test_PDFRawStream():
     x = pdf.PDFRawStream(b"agsgaha")
     assert x.contents == b"agsgaha"